@@ -1,5 +1,9 @@
-from functools import partial
+import asyncio
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
 
+from aioafero import AferoState
 from aioafero.v1 import AferoBridgeV1
 from aioafero.v1.controllers.event import EventType
 from aioafero.v1.controllers.thermostat import ThermostatController
@@ -19,14 +23,89 @@ from homeassistant.components.climate import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .bridge import HubspaceBridge
-from .const import DOMAIN
+from .const import DEVICE_CLASS_PORTABLE_AC, DOMAIN
 from .entity import HubspaceBaseEntity, update_decorator
 
 
+def _invert_mapping(mapping: Mapping[str, str]) -> MappingProxyType:
+    """Build a HomeAssistant -> Hubspace lookup from a Hubspace -> HomeAssistant one
+
+    If several Hubspace values map to the same HomeAssistant value, the
+    first one listed is used when sending to Hubspace.
+    """
+    inverted: dict[str, str] = {}
+    for hubspace_val, ha_val in mapping.items():
+        inverted.setdefault(ha_val, hubspace_val)
+    return MappingProxyType(inverted)
+
+
+def _get_state_value(
+    states: list[AferoState], function_class: str, default: Any
+) -> Any:
+    """Get the value of the first state matching the function class"""
+    for state in states:
+        if state.functionClass == function_class:
+            return state.value
+    return default
+
+
+# Seconds to wait for more changes before sending them to Hubspace
+_UPDATE_DEBOUNCE: float = 0.1
+
+# Map specific air conditioner functions
+_FAN_SPEED_MAPPING = MappingProxyType(
+    {
+        "fan-speed-auto": FAN_ON,
+        "fan-speed-2-050": "low",
+        "fan-speed-2-100": "high",
+    }
+)
+_FAN_SPEED_REVERSE = _invert_mapping(_FAN_SPEED_MAPPING)
+_get_fan_speed = _FAN_SPEED_MAPPING.get
+_HVAC_MODE_MAPPING = MappingProxyType(
+    {
+        "cool": HVACMode.COOL,
+        "auto-cool": HVACMode.HEAT_COOL,
+        "fan": HVACMode.FAN_ONLY,
+        "off": HVACMode.OFF,
+    }
+)
+_HVAC_MODE_REVERSE = _invert_mapping(_HVAC_MODE_MAPPING)
+_get_hvac_mode = _HVAC_MODE_MAPPING.get
+_HVAC_ACTION_MAPPING = MappingProxyType(
+    {
+        "cooling": HVACAction.COOLING,
+        "heating": HVACAction.HEATING,
+        "off": HVACAction.OFF,
+    }
+)
+_ERROR_STATES = MappingProxyType(
+    {
+        "indoor-temperature-sensor-failed": "Indoor temperature sensor failed",
+        "water-tray-full": "Water tray full",
+    }
+)
+# States reported through extra_state_attributes
+_ATTRIBUTE_STATES: frozenset[str] = frozenset({"error", "sleep", "timer"})
+# Resource capability -> feature it enables
+_FEATURE_FLAGS: tuple[tuple[str, ClimateEntityFeature], ...] = (
+    ("target_temperature", ClimateEntityFeature.TARGET_TEMPERATURE),
+    ("supports_fan_mode", ClimateEntityFeature.FAN_MODE),
+    ("supports_temperature_range", ClimateEntityFeature.TARGET_TEMPERATURE_RANGE),
+)
+
+
 class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
+    # Hubspace always returns in C
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+    # Supported modes are the same for every device so share them
+    _attr_fan_modes = tuple(_FAN_SPEED_MAPPING.values())
+    _attr_hvac_modes = tuple(_HVAC_MODE_MAPPING.values())
+
     def __init__(
         self,
         bridge: HubspaceBridge,
@@ -34,49 +113,90 @@ class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
         resource: Thermostat,
     ) -> None:
         super().__init__(bridge, controller, resource)
-        self._supported_fan: list[str] = []
-        self._supported_hvac_modes: list[HVACMode]
-        self._supported_features: ClimateEntityFeature = ClimateEntityFeature(0)
-        if self.resource.target_temperature:
-            self._supported_features |= ClimateEntityFeature.TARGET_TEMPERATURE
-        if self.resource.supports_fan_mode:
-            self._supported_features |= ClimateEntityFeature.FAN_MODE
-        if self.resource.supports_temperature_range:
-            self._supported_features |= ClimateEntityFeature.TARGET_TEMPERATURE_RANGE
-
-        # Map specific air conditioner functions
-        self._fan_speed_mapping = {
-            "fan-speed-auto": FAN_ON,
-            "fan-speed-2-050": "low",
-            "fan-speed-2-100": "high",
-        }
-        self._hvac_mode_mapping = {
-            "cool": HVACMode.COOL,
-            "auto-cool": HVACMode.HEAT_COOL,
-            "fan": HVACMode.FAN_ONLY,
-            "off": HVACMode.OFF,
-        }
-        self._error_states = {
-            "indoor-temperature-sensor-failed": "Indoor temperature sensor failed",
-            "water-tray-full": "Water tray full",
-        }
+        self._attr_supported_features = ClimateEntityFeature(0)
+        for attr, flag in _FEATURE_FLAGS:
+            if getattr(self.resource, attr):
+                self._attr_supported_features |= flag
+        self._last_state_tuple: tuple | None = None
+        self._error_states: list[str] = self._compute_error_states()
+        self._pending: dict[str, Any] = {}
+        self._debouncer: Debouncer | None = None
+        self._flush_future: asyncio.Future | None = None
+        self._flush_lock = asyncio.Lock()
+        # Bind the request path once as it is used for every update
+        self._request_call = bridge.async_request_call
+        self._set_state = controller.set_state
+        self._device_id: str = resource.id
+
+    def _state_snapshot(self) -> tuple:
+        """Raw resource values that make up the state written to HA
+
+        Values that never change for an entity (fan / hvac modes, features,
+        unit) are not included.
+        """
+        resource = self.resource
+        return (
+            resource.available,
+            resource.current_temperature,
+            resource.target_temperature,
+            tuple(resource.target_temperature_range),
+            resource.target_temperature_step,
+            resource.target_temperature_min,
+            resource.target_temperature_max,
+            resource.hvac_mode.mode,
+            resource.fan_mode.mode,
+            resource.hvac_action,
+            tuple(
+                (state.functionClass, state.functionInstance, state.value)
+                for state in resource.states
+                if state.functionClass in _ATTRIBUTE_STATES
+            ),
+        )
+
+    def _compute_error_states(self) -> list[str]:
+        """Get the alerting error states"""
+        get_error = _ERROR_STATES.get
+        return [
+            get_error(state.functionInstance, state.value)
+            for state in self.resource.states
+            if state.functionClass == "error" and state.value == "alerting"
+        ]
+
+    async def async_added_to_hass(self) -> None:
+        """Call when entity is added."""
+        await super().async_added_to_hass()
+        self._debouncer = Debouncer(
+            self.hass,
+            self.logger,
+            cooldown=_UPDATE_DEBOUNCE,
+            immediate=False,
+            function=self._flush,
+            background=True,
+        )
+        # HA writes the initial state right after this
+        self._last_state_tuple = self._state_snapshot()
+
+    @callback
+    def _handle_event(self, event_type: EventType, resource) -> None:
+        """Only write the state when a tracked value has changed."""
+        snapshot = self._state_snapshot()
+        if snapshot == self._last_state_tuple:
+            return
+        self._last_state_tuple = snapshot
+        self._error_states = self._compute_error_states()
+        if self._error_states:
+            self.logger.debug("Error states detected: %s", self._error_states)
+        super()._handle_event(event_type, resource)
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        attributes = {
-            "error_states": [
-                self._error_states.get(state.functionInstance, state.value)
-                for state in self.resource.states
-                if state.functionClass == "error" and state.value == "alerting"
-            ],
-            "sleep_mode": self.resource.states.get("sleep", {}).get("value", "off"),
-            "timer": self.resource.states.get("timer", {}).get("value", 0),
+        states = self.resource.states
+        return {
+            "error_states": self._error_states,
+            "sleep_mode": _get_state_value(states, "sleep", "off"),
+            "timer": _get_state_value(states, "timer", 0),
         }
-        # Add debug logging for error states
-        if attributes["error_states"]:
-            self.logger.debug("Error states detected: %s", attributes["error_states"])
-        return attributes
 
     @property
     def current_temperature(self) -> float | None:
@@ -84,34 +204,19 @@ class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
 
     @property
     def fan_mode(self) -> str | None:
-        return self._fan_speed_mapping.get(self.resource.fan_mode.mode, FAN_OFF)
-
-    @property
-    def fan_modes(self) -> list[str] | None:
-        return list(self._fan_speed_mapping.values())
+        return _get_fan_speed(self.resource.fan_mode.mode, FAN_OFF)
 
     @property
     def hvac_action(self) -> HVACAction | None:
-        mapping = {
-            "cooling": HVACAction.COOLING,
-            "heating": HVACAction.HEATING,
-            "off": HVACAction.OFF,
-        }
-        mapped = mapping.get(self.resource.hvac_action)
-        if mapped:
-            return mapped
-        elif self.resource.hvac_mode.mode == "fan":
-            return HVACAction.FAN
-        else:
-            return self.resource.hvac_action
+        resource = self.resource
+        action = resource.hvac_action
+        return _HVAC_ACTION_MAPPING.get(action) or (
+            HVACAction.FAN if resource.hvac_mode.mode == "fan" else action
+        )
 
     @property
     def hvac_mode(self) -> HVACMode | None:
-        return self._hvac_mode_mapping.get(self.resource.hvac_mode.mode, HVACMode.OFF)
-
-    @property
-    def hvac_modes(self) -> list[HVACMode]:
-        return list(self._hvac_mode_mapping.values())
+        return _get_hvac_mode(self.resource.hvac_mode.mode, HVACMode.OFF)
 
     @property
     def max_temp(self) -> float | None:
@@ -121,10 +226,6 @@ class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
     def min_temp(self) -> float | None:
         return self.resource.target_temperature_min
 
-    @property
-    def supported_features(self):
-        return self._supported_features
-
     @property
     def target_temperature(self) -> float | None:
         return self.resource.target_temperature
@@ -141,76 +242,101 @@ class HubspaceThermostat(HubspaceBaseEntity, ClimateEntity):
     def target_temperature_step(self) -> float | None:
         return self.resource.target_temperature_step
 
-    @property
-    def temperature_unit(self) -> str:
-        # Hubspace always returns in C
-        return UnitOfTemperature.CELSIUS
+    async def _queue_update(self, **kwargs: Any) -> None:
+        """Queue values to send, coalescing calls made in quick succession
 
-    @update_decorator
-    async def translate_hvac_mode_to_hubspace(self, hvac_mode) -> str | None:
-        """Convert HomeAssistant -> Hubspace"""
-        tracked_modes = {
-            HVACMode.OFF: "off",
-            HVACMode.HEAT: "heat",
-            HVACMode.COOL: "cool",
-            HVACMode.FAN_ONLY: "fan",
-            HVACMode.HEAT_COOL: "auto",
-        }
-        return tracked_modes.get(hvac_mode)
+        Scenes and automations often call several climate services at once.
+        Merge everything requested within the debounce window into a single
+        set_state call. Every caller waits for that call to finish.
+        """
+        self._pending.update(kwargs)
+        if self._flush_future is None:
+            self._flush_future = asyncio.get_running_loop().create_future()
+        future = self._flush_future
+        if self._debouncer is None:
+            # Not part of HA (yet or anymore) so send right away
+            await self._flush()
+        else:
+            self._debouncer.async_schedule_call()
+        # Shielded so one cancelled caller does not cancel the others
+        await asyncio.shield(future)
+
+    async def _flush(self) -> None:
+        """Send all queued values to Hubspace
+
+        The debouncer ignores calls made while a flush is running, so keep
+        sending until nothing new was queued during the request.
+        """
+        async with self._flush_lock:
+            while (future := self._flush_future) is not None:
+                self._flush_future = None
+                pending, self._pending = self._pending, {}
+                try:
+                    if pending:
+                        await self._request_call(
+                            self._set_state, device_id=self._device_id, **pending
+                        )
+                except Exception as err:
+                    self.logger.warning(
+                        "Unable to send %s to %s: %s", pending, self._device_id, err
+                    )
+                    if not future.done():
+                        future.set_exception(err)
+                        # Already logged; avoid the warning when nobody awaits it
+                        future.exception()
+                else:
+                    if not future.done():
+                        future.set_result(None)
+                finally:
+                    # Never leave callers waiting if the flush itself is cancelled
+                    if not future.done():
+                        future.cancel()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Send anything still queued before the entity goes away"""
+        if self._debouncer is not None:
+            self._debouncer.async_shutdown()
+            self._debouncer = None
+        await self._flush()
+        await super().async_will_remove_from_hass()
 
     @update_decorator
     async def async_set_hvac_mode(self, hvac_mode: str) -> None:
         """Set new hvac mode."""
-        hubspace_mode = next((k for k, v in self._hvac_mode_mapping.items() if v == hvac_mode), None)
+        hubspace_mode = _HVAC_MODE_REVERSE.get(hvac_mode)
         if hubspace_mode:
-            await self.bridge.async_request_call(
-                self.controller.set_state,
-                device_id=self.resource.id,
-                hvac_mode=hubspace_mode,
-            )
+            await self._queue_update(hvac_mode=hubspace_mode)
 
     @update_decorator
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set new fan mode."""
-        hubspace_mode = next((k for k, v in self._fan_speed_mapping.items() if v == fan_mode), None)
+        hubspace_mode = _FAN_SPEED_REVERSE.get(fan_mode)
         if hubspace_mode:
-            await self.bridge.async_request_call(
-                self.controller.set_state,
-                device_id=self.resource.id,
-                fan_mode=hubspace_mode,
-            )
+            await self._queue_update(fan_mode=hubspace_mode)
 
     @update_decorator
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            target_temperature=kwargs.get(ATTR_TEMPERATURE),
-            target_temperature_auto_cooling=kwargs.get(ATTR_TARGET_TEMP_HIGH),
-            target_temperature_auto_heating=kwargs.get(ATTR_TARGET_TEMP_LOW),
-            hvac_mode=await self.translate_hvac_mode_to_hubspace(
-                kwargs.get(ATTR_HVAC_MODE)
-            ),
-        )
+        updates = {
+            "target_temperature": kwargs.get(ATTR_TEMPERATURE),
+            "target_temperature_auto_cooling": kwargs.get(ATTR_TARGET_TEMP_HIGH),
+            "target_temperature_auto_heating": kwargs.get(ATTR_TARGET_TEMP_LOW),
+            "hvac_mode": _HVAC_MODE_REVERSE.get(kwargs.get(ATTR_HVAC_MODE)),
+        }
+        updates = {key: val for key, val in updates.items() if val is not None}
+        if not updates:
+            return
+        await self._queue_update(**updates)
 
     @update_decorator
     async def async_set_sleep_mode(self, sleep_mode: str) -> None:
         """Set sleep mode."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            sleep_mode=sleep_mode,
-        )
+        await self._queue_update(sleep_mode=sleep_mode)
 
     @update_decorator
     async def async_set_timer(self, timer: int) -> None:
         """Set timer."""
-        await self.bridge.async_request_call(
-            self.controller.set_state,
-            device_id=self.resource.id,
-            timer=timer,
-        )
+        await self._queue_update(timer=timer)
 
 
 async def async_setup_entry(
@@ -222,16 +348,42 @@ async def async_setup_entry(
     bridge: HubspaceBridge = hass.data[DOMAIN][config_entry.entry_id]
     api: AferoBridgeV1 = bridge.api
     controller: ThermostatController = api.thermostats
-    make_entity = partial(HubspaceThermostat, bridge, controller)
 
     # Debug log for devices
     bridge.logger.debug("Available devices: %s", api.devices)
 
+    seen_ids: set[str] = set()
+
+    @callback
+    def async_handle_event(event_type: EventType, resource: Thermostat) -> None:
+        """Add an entity for a new device, or forget a removed one."""
+        if event_type == EventType.RESOURCE_DELETED:
+            seen_ids.discard(resource.id)
+            return
+        if (
+            resource.device_class != DEVICE_CLASS_PORTABLE_AC
+            or resource.id in seen_ids
+        ):
+            return
+        seen_ids.add(resource.id)
+        bridge.logger.debug("Adding entity for resource: %s", resource)
+        async_add_entities([HubspaceThermostat(bridge, controller, resource)])
+
+    # register listener for new entities. seen_ids prevents an entity being
+    # created twice for the same device
+    config_entry.async_on_unload(
+        api.devices.subscribe(
+            async_handle_event,
+            event_filter=(EventType.RESOURCE_ADDED, EventType.RESOURCE_DELETED),
+        )
+    )
+
     entities = []
     for device in api.devices:
-        if device.device_class == "portable-air-conditioner":
+        if device.device_class == DEVICE_CLASS_PORTABLE_AC:
             bridge.logger.debug("Processing air conditioner device: %s", device.friendly_name)
-            entities.append(make_entity(device))
+            seen_ids.add(device.id)
+            entities.append(HubspaceThermostat(bridge, controller, device))
 
     if entities:
         async_add_entities(entities)
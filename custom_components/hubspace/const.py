@@ -63,6 +63,7 @@ DEVICE_CLASS_OUTLET: Final[str] = "power-outlet"
 DEVICE_CLASS_LANDSCAPE_TRANSFORMER: Final[str] = "landscape-transformer"
 DEVICE_CLASS_DOOR_LOCK: Final[str] = "door-lock"
 DEVICE_CLASS_WATER_TIMER: Final[str] = "water-timer"
+DEVICE_CLASS_PORTABLE_AC: Final[str] = "portable-air-conditioner"
 
 DEVICE_CLASS_TO_ENTITY_MAP: Final[dict[str, str]] = {
     DEVICE_CLASS_FREEZER: ENTITY_CLIMATE,
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from aioafero import AferoState
 from homeassistant.components.climate import (
@@ -11,8 +13,11 @@ from homeassistant.components.climate import (
     HVACAction,
     HVACMode,
 )
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry as er
 
+from custom_components.hubspace.const import DOMAIN
+
 from .utils import create_devices_from_data, modify_state
 
 thermostat = create_devices_from_data("thermostat.json")[0]
@@ -440,3 +445,183 @@ async def test_set_temperature(mocked_entity):
     assert entity.attributes[ATTR_TARGET_TEMP_HIGH] == 27.0
     assert entity.attributes[ATTR_TARGET_TEMP_LOW] == 14.0
     assert entity.attributes[ATTR_TEMPERATURE] == 12.0
+
+
+@pytest.fixture
+async def mocked_ac(mocked_entry):
+    hass, entry, bridge = mocked_entry
+    ac = create_devices_from_data("portable-ac.json")[0]
+    await bridge.thermostats.initialize_elem(ac)
+    await bridge.devices.initialize_elem(ac)
+    bridge.thermostats._initialize = True
+    bridge.devices._initialize = True
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_id = er.async_get(hass).async_get_entity_id("climate", DOMAIN, ac.id)
+    assert entity_id is not None
+    yield hass, bridge, ac, entity_id
+    await bridge.close()
+
+
+def emit_ac_update(bridge, ac_update):
+    event = {
+        "type": "update",
+        "device_id": ac_update.id,
+        "device": ac_update,
+    }
+    bridge.emit_event("update", event)
+
+
+@pytest.mark.asyncio
+async def test_ac_state_write_only_on_change(mocked_ac, mocker):
+    hass, bridge, _, entity_id = mocked_ac
+    entity = hass.data["climate"].get_entity(entity_id)
+    write_state = mocker.spy(entity, "async_write_ha_state")
+    # Nothing has changed
+    emit_ac_update(bridge, create_devices_from_data("portable-ac.json")[0])
+    await hass.async_block_till_done()
+    assert write_state.call_count == 0
+    # Current temperature has changed
+    ac_update = create_devices_from_data("portable-ac.json")[0]
+    modify_state(
+        ac_update,
+        AferoState(
+            functionClass="temperature",
+            functionInstance="current-temp",
+            value=21,
+        ),
+    )
+    emit_ac_update(bridge, ac_update)
+    await hass.async_block_till_done()
+    assert write_state.call_count == 1
+    assert hass.states.get(entity_id).attributes["current_temperature"] == 21
+
+
+@pytest.mark.asyncio
+async def test_ac_coalesces_commands(mocked_ac):
+    hass, bridge, ac, entity_id = mocked_ac
+    bridge.request.reset_mock()
+    await asyncio.gather(
+        hass.services.async_call(
+            "climate",
+            "set_hvac_mode",
+            {"entity_id": entity_id, ATTR_HVAC_MODE: HVACMode.FAN_ONLY},
+            blocking=True,
+        ),
+        hass.services.async_call(
+            "climate",
+            "set_fan_mode",
+            {"entity_id": entity_id, "fan_mode": "high"},
+            blocking=True,
+        ),
+    )
+    put_calls = [
+        call for call in bridge.request.call_args_list if call.args[0] == "put"
+    ]
+    assert len(put_calls) == 1
+    payload = put_calls[0].kwargs["json"]
+    assert payload["metadeviceId"] == ac.id
+    sent = {(val["functionClass"], val["value"]) for val in payload["values"]}
+    assert ("mode", "fan") in sent
+    assert ("fan-mode", "fan-speed-2-100") in sent
+
+
+@pytest.mark.asyncio
+async def test_ac_request_failure_reaches_all_callers(mocked_ac):
+    hass, bridge, _, entity_id = mocked_ac
+    bridge.request.side_effect = Exception("Request failed")
+    results = await asyncio.gather(
+        hass.services.async_call(
+            "climate",
+            "set_hvac_mode",
+            {"entity_id": entity_id, ATTR_HVAC_MODE: HVACMode.FAN_ONLY},
+            blocking=True,
+        ),
+        hass.services.async_call(
+            "climate",
+            "set_fan_mode",
+            {"entity_id": entity_id, "fan_mode": "high"},
+            blocking=True,
+        ),
+        return_exceptions=True,
+    )
+    assert len(results) == 2
+    for result in results:
+        assert isinstance(result, HomeAssistantError)
+
+
+@pytest.mark.asyncio
+async def test_ac_set_temperature_without_values(mocked_ac):
+    hass, bridge, _, entity_id = mocked_ac
+    entity = hass.data["climate"].get_entity(entity_id)
+    bridge.request.reset_mock()
+    await entity.async_set_temperature()
+    await hass.async_block_till_done()
+    bridge.request.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_add_new_ac(mocked_entry):
+    hass, entry, bridge = mocked_entry
+    # Register callbacks
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_reg = er.async_get(hass)
+    hs_new_dev = create_devices_from_data("portable-ac.json")[0]
+    event = {
+        "type": "add",
+        "device_id": hs_new_dev.id,
+        "device": hs_new_dev,
+    }
+    for _ in range(2):
+        bridge.emit_event("add", event)
+        await hass.async_block_till_done()
+        climate_entities = [
+            ent
+            for ent in er.async_entries_for_config_entry(entity_reg, entry.entry_id)
+            if ent.domain == "climate"
+        ]
+        assert len(climate_entities) == 1
+        assert climate_entities[0].unique_id == hs_new_dev.id
+    await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_ac_command_queued_during_request(mocked_ac):
+    hass, bridge, _, entity_id = mocked_ac
+    release = asyncio.Event()
+    puts = []
+    original_request = bridge.request.side_effect
+
+    async def slow_request(*args, **kwargs):
+        if args[0] == "put":
+            puts.append(kwargs["json"])
+            if len(puts) == 1:
+                await release.wait()
+        return await original_request(*args, **kwargs)
+
+    bridge.request.side_effect = slow_request
+
+    def set_temperature(temperature):
+        return hass.async_create_task(
+            hass.services.async_call(
+                "climate",
+                "set_temperature",
+                {"entity_id": entity_id, ATTR_TEMPERATURE: temperature},
+                blocking=True,
+            )
+        )
+
+    first = set_temperature(20)
+    # Wait for the first request to be blocked
+    for _ in range(50):
+        if puts:
+            break
+        await asyncio.sleep(0.05)
+    assert len(puts) == 1
+    second = set_temperature(23)
+    await asyncio.sleep(0.2)
+    release.set()
+    await asyncio.wait_for(asyncio.gather(first, second), timeout=5)
+    assert len(puts) == 2
+    assert any(val["value"] == 23 for val in puts[1]["values"])
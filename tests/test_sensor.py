@@ -1,51 +1,55 @@
+import asyncio
+
 import pytest
 from homeassistant.helpers import entity_registry as er
 
 from .utils import create_devices_from_data, modify_state
 from aioafero import AferoState
 
-transformer = create_devices_from_data("transformer.json")[0]
 transformer_voltage = "sensor.friendly_device_6_output_voltage_switch"
 transformer_watts = "sensor.friendly_device_6_watts"
 transformer_rssi = "sensor.friendly_device_6_wifi_rssi"
 
 
 @pytest.fixture
-async def mocked_entity(mocked_entry):
-    hass, entry, bridge = mocked_entry
-    await bridge.switches.initialize_elem(transformer)
-    await bridge.devices.initialize_elem(transformer)
-    bridge.switches._initialize = True
+def transformer():
+    return create_devices_from_data("transformer.json")[0]
+
+
+async def _setup_bridge_with_device(hass, entry, bridge, dev):
+    await asyncio.gather(
+        bridge.devices.initialize_elem(dev),
+        bridge.switches.initialize_elem(dev),
+    )
     bridge.devices._initialize = True
+    bridge.switches._initialize = True
     await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
+
+
+@pytest.fixture
+async def mocked_entity(mocked_entry, transformer):
+    hass, entry, bridge = mocked_entry
+    await _setup_bridge_with_device(hass, entry, bridge, transformer)
     yield hass, entry, bridge
     await bridge.close()
 
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "dev,expected_entities",
+    "expected_entities",
     [
-        (
-            transformer,
-            {
-                transformer_voltage: ("12", "V"),
-                transformer_watts: ("0", "W"),
-                transformer_rssi: ("-51", "dB"),
-            },
-        ),
+        {
+            transformer_voltage: ("12", "V"),
+            transformer_watts: ("0", "W"),
+            transformer_rssi: ("-51", "dB"),
+        },
     ],
 )
-async def test_async_setup_entry(dev, expected_entities, mocked_entry):
+async def test_async_setup_entry(expected_entities, mocked_entry, transformer):
     try:
         hass, entry, bridge = mocked_entry
-        await bridge.devices.initialize_elem(dev)
-        bridge.devices._initialize = True
-        await bridge.switches.initialize_elem(dev)
-        bridge.switches._initialize = True
-        await hass.config_entries.async_setup(entry.entry_id)
-        await hass.async_block_till_done()
+        await _setup_bridge_with_device(hass, entry, bridge, transformer)
         entity_reg = er.async_get(hass)
         for entity_id, exp in expected_entities.items():
             exp_value, exp_measurement = exp
@@ -90,14 +94,9 @@ async def test_add_new_device(mocked_entry):
 
 
 @pytest.mark.asyncio
-async def test_update(mocked_entry):
+async def test_update(mocked_entry, transformer):
     hass, entry, bridge = mocked_entry
-    await bridge.devices.initialize_elem(transformer)
-    bridge.devices._initialize = True
-    await bridge.switches.initialize_elem(transformer)
-    bridge.switches._initialize = True
-    await hass.config_entries.async_setup(entry.entry_id)
-    await hass.async_block_till_done()
+    await _setup_bridge_with_device(hass, entry, bridge, transformer)
     # Now generate update event by emitting the json we've sent as incoming event
     hs_new_dev = create_devices_from_data("transformer.json")[0]
     modify_state(
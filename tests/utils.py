@@ -1,5 +1,7 @@
+import copy
 import json
 import os
+from functools import lru_cache
 from typing import Any
 
 from aioafero import AferoDevice, AferoState
@@ -7,13 +9,21 @@ from aioafero import AferoDevice, AferoState
 current_path: str = os.path.dirname(os.path.realpath(__file__))
 
 
+@lru_cache
+def _load_device_dump(file_name: str) -> Any:
+    with open(os.path.join(current_path, "device_dumps", file_name), "r") as fh:
+        return json.load(fh)
+
+
 def get_device_dump(file_name: str) -> Any:
     """Get a device dump
 
+    The file is only read once; each call returns a fresh copy so tests
+    can modify it freely.
+
     :param file_name: Name of the file to load
     """
-    with open(os.path.join(current_path, "device_dumps", file_name), "r") as fh:
-        return json.load(fh)
+    return copy.deepcopy(_load_device_dump(file_name))
 
 
 def create_devices_from_data(file_name: str) -> list[AferoDevice]: